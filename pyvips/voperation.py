@@ -1,10 +1,25 @@
 from __future__ import division, print_function
 
+import atexit
 import logging
+import os
+import pickle
 
 import pyvips
 from pyvips import ffi, vips_lib, Error, _to_bytes, _to_string, GValue, \
-    type_map, type_from_name, nickname_find, at_least_libvips
+    type_name, type_from_name, nickname_find, at_least_libvips
+from pyvips.error import text_type
+
+try:
+    from functools import lru_cache
+except ImportError:
+    # no lru_cache on Python 2 ... the plain dict caches still work, we
+    # just lose the C-level fast path on hits
+    def lru_cache(maxsize=None):
+        def decorator(fn):
+            return fn
+
+        return decorator
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +33,43 @@ _OUTPUT = 32
 _DEPRECATED = 64
 _MODIFY = 128
 
+# masks for classifying args into categories ... each category is then a
+# single AND+compare on the flags
+_REQUIRED_INPUT_MASK = _INPUT | _REQUIRED | _DEPRECATED
+_REQUIRED_INPUT_FLAGS = _INPUT | _REQUIRED
+_REQUIRED_OUTPUT_MASK = _OUTPUT | _REQUIRED | _DEPRECATED
+_REQUIRED_OUTPUT_FLAGS = _OUTPUT | _REQUIRED
+_OPTIONAL_INPUT_MASK = _INPUT | _REQUIRED
+_OPTIONAL_INPUT_FLAGS = _INPUT
+_OPTIONAL_OUTPUT_MASK = _OUTPUT | _REQUIRED
+_OPTIONAL_OUTPUT_FLAGS = _OUTPUT
+
 # for VipsOperationFlags
 _OPERATION_DEPRECATED = 8
 
+# rebind the symbols Operation.call touches on every invocation as module
+# globals ... a single LOAD_GLOBAL is cheaper than the two-hop attribute
+# lookup through the library object
+_vips_cache_operation_build = vips_lib.vips_cache_operation_build
+_vips_object_unref_outputs = vips_lib.vips_object_unref_outputs
+_vips_operation_new = vips_lib.vips_operation_new
+_ffi_NULL = ffi.NULL
+
+# the Image class and the image gtypes, resolved on first call ... vimage
+# imports after us, so we can't look these up at import time, and binding
+# them here keeps the two-hop pyvips.* lookups off the call path
+_Image = None
+_image_type = None
+_array_image_type = None
+
+
+def _resolve_image():
+    global _Image, _image_type, _array_image_type
+
+    _Image = pyvips.Image
+    _image_type = GValue.image_type
+    _array_image_type = GValue.array_image_type
+
 
 class Introspect(object):
     """Build introspection data for operations.
@@ -29,18 +78,21 @@ class Introspect(object):
     everything we know about it.
 
     """
-    __slots__ = ('description', 'flags', 'details',
-                 'required_input', 'optional_input',
+    __slots__ = ('name', 'description', 'flags', 'details', 'blurbs',
+                 'types_resolved',
+                 'required_input', 'required_input_details',
+                 'optional_input', 'optional_details',
                  'required_output', 'optional_output',
                  'member_x', 'method_args')
 
     def __init__(self, operation_name):
         op = Operation.new_from_name(operation_name)
 
+        self.name = operation_name
         self.description = op.get_description()
         self.flags = vips_lib.vips_operation_get_flags(op.pointer)
 
-        # build a list of constructor arg [name, flags] pairs in arg order
+        # build a list of constructor arg (name, flags) pairs in arg order
         arguments = []
 
         def add_args(name, flags):
@@ -48,7 +100,7 @@ class Introspect(object):
                 # libvips uses '-' to separate parts of arg names, but we
                 # need '_' for Python
                 name = name.replace('-', '_')
-                arguments.append([name, flags])
+                arguments.append((name, flags))
 
         if at_least_libvips(8, 7):
             p_names = ffi.new('char**[1]')
@@ -58,12 +110,15 @@ class Introspect(object):
                                                    p_names, p_flags, p_n_args)
             if result != 0:
                 raise Error('unable to get arguments from operation')
-            p_names = p_names[0]
-            p_flags = p_flags[0]
             n_args = p_n_args[0]
 
-            for i in range(0, n_args):
-                add_args(_to_string(p_names[i]), p_flags[i])
+            # unpack both arrays in one go, rather than paying a CFFI
+            # indexing hop per element
+            names = ffi.unpack(p_names[0], n_args)
+            flags = ffi.unpack(p_flags[0], n_args)
+
+            for name, flag in zip(names, flags):
+                add_args(_to_string(name), flag)
         else:
             def add_construct(self, pspec, argument_class,
                               argument_instance, a, b):
@@ -75,47 +130,56 @@ class Introspect(object):
 
         # logger.debug('arguments = %s', self.arguments)
 
-        # build a hash from arg name to detailed arg information
+        # build a hash from arg name to detailed arg information, and sort
+        # the names into the category lists, in a single pass
+        #
+        # don't fetch blurbs here: they are only read by the docstring
+        # generators, and each one is an FFI round-trip ... see get_blurb()
         self.details = {}
-        for name, flags in arguments:
-            self.details[name] = {
-                "name": name,
-                "flags": flags,
-                "blurb": op.get_blurb(name),
-                "type": op.get_typeof(name)
-            }
+        self.blurbs = {}
+
+        # a fresh build holds live gtype ids ... entries loaded from the
+        # disc cache hold type names until _resolve_types() runs
+        self.types_resolved = True
 
-        # lists of arg names by category
         self.required_input = []
         self.optional_input = []
         self.required_output = []
         self.optional_output = []
 
         for name, flags in arguments:
-            if ((flags & _INPUT) != 0 and
-                    (flags & _REQUIRED) != 0 and
-                    (flags & _DEPRECATED) == 0):
+            self.details[name] = {
+                "flags": flags,
+                "type": op.get_typeof(name)
+            }
+
+            if (flags & _REQUIRED_INPUT_MASK) == _REQUIRED_INPUT_FLAGS:
                 self.required_input.append(name)
 
                 # required inputs which we MODIFY are also required outputs
                 if (flags & _MODIFY) != 0:
                     self.required_output.append(name)
 
-            if ((flags & _OUTPUT) != 0 and
-                    (flags & _REQUIRED) != 0 and
-                    (flags & _DEPRECATED) == 0):
+            if (flags & _REQUIRED_OUTPUT_MASK) == _REQUIRED_OUTPUT_FLAGS:
                 self.required_output.append(name)
 
             # we let deprecated optional args through, but warn about them
             # if they get used, see below
-            if ((flags & _INPUT) != 0 and
-                    (flags & _REQUIRED) == 0):
+            if (flags & _OPTIONAL_INPUT_MASK) == _OPTIONAL_INPUT_FLAGS:
                 self.optional_input.append(name)
 
-            if ((flags & _OUTPUT) != 0 and
-                    (flags & _REQUIRED) == 0):
+            if (flags & _OPTIONAL_OUTPUT_MASK) == _OPTIONAL_OUTPUT_FLAGS:
                 self.optional_output.append(name)
 
+        # precompute the arg details Operation.call needs on the hot path,
+        # so it doesn't have to do a dict lookup per argument per call
+        self.required_input_details = \
+            [(name, self.details[name]['flags'], self.details[name])
+             for name in self.required_input]
+        self.optional_details = \
+            {name: (self.details[name]['flags'], self.details[name])
+             for name in self.optional_input + self.optional_output}
+
         # find the first required input image arg, if any ... that will be self
         self.member_x = None
         for name in self.required_input:
@@ -132,31 +196,178 @@ class Introspect(object):
         else:
             self.method_args = self.required_input
 
-    # a hash mapping operation names to introspection data
-    _introspect_cache = {}
+    def __getstate__(self):
+        # gtype ids are assigned in registration order and can differ
+        # between processes, so pickle arg types by name ... an entry we
+        # loaded but never resolved holds names already
+        state = {}
+        for slot in self.__slots__:
+            state[slot] = getattr(self, slot)
+
+        if self.types_resolved:
+            state['details'] = \
+                {name: {'flags': details['flags'],
+                        'type': type_name(details['type'])}
+                 for name, details in self.details.items()}
+
+        # these alias the details dicts, so they are rebuilt on load
+        del state['required_input_details']
+        del state['optional_details']
+        del state['types_resolved']
+
+        return state
+
+    def __setstate__(self, state):
+        details = state.pop('details')
+
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+        # the types in details are names ... we can't look the ids up here,
+        # since libvips registers many gtypes (the enums, especially)
+        # lazily, see _resolve_types()
+        self.details = details
+        self.types_resolved = False
+        self.required_input_details = \
+            [(name, details[name]['flags'], details[name])
+             for name in self.required_input]
+        self.optional_details = \
+            {name: (details[name]['flags'], details[name])
+             for name in self.optional_input + self.optional_output}
+
+    def _resolve_types(self):
+        # a gtype is only registered once something references the type, so
+        # build the operation first ... that pulls in everything its args
+        # use, including the enums
+        Operation.new_from_name(self.name)
+
+        for details in self.details.values():
+            gtype = details['type']
+            if isinstance(gtype, text_type):
+                details['type'] = type_from_name(gtype)
+
+        self.types_resolved = True
+
+    def get_blurb(self, name):
+        """Get the blurb for an argument.
+
+        Blurbs are fetched lazily on first use, since only the docstring
+        generators ever read them.
 
-    @classmethod
-    def get(cls, operation_name):
-        if operation_name not in cls._introspect_cache:
-            cls._introspect_cache[operation_name] = Introspect(operation_name)
+        """
 
-        return cls._introspect_cache[operation_name]
+        if not self.blurbs:
+            op = Operation.new_from_name(self.name)
+            for arg_name in self.details:
+                self.blurbs[arg_name] = op.get_blurb(arg_name)
 
+        return self.blurbs[name]
 
-# search an array with a predicate, recursing into subarrays as we see them
-# used to find the match_image for an operation
-def _find_inside(pred, thing):
-    if pred(thing):
-        return thing
+    @staticmethod
+    def _cache_filename():
+        # introspection data is plain Python, so we can persist it between
+        # processes and skip all the FFI hops on startup ... key the file by
+        # libvips and pyvips versions, since it depends on both
+        if 'XDG_CACHE_HOME' in os.environ:
+            cache_dir = os.environ['XDG_CACHE_HOME']
+        else:
+            cache_dir = os.path.join(os.path.expanduser('~'), '.cache')
 
-    if isinstance(thing, list) or isinstance(thing, tuple):
-        for x in thing:
-            result = _find_inside(pred, x)
+        filename = 'introspect-{0}.{1}.{2}-{3}.pickle'.format(
+            vips_lib.vips_version(0),
+            vips_lib.vips_version(1),
+            vips_lib.vips_version(2),
+            pyvips.__version__)
 
-            if result is not None:
-                return result
+        return os.path.join(cache_dir, 'pyvips', filename)
+
+    @classmethod
+    def _load_cache(cls):
+        # a broken or unreadable cache file just means a cold start
+        try:
+            with open(cls._cache_filename(), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return {}
 
-    return None
+    @classmethod
+    def _save_cache(cls):
+        if not cls._cache_dirty:
+            return
+
+        try:
+            filename = cls._cache_filename()
+            cache_dir = os.path.dirname(filename)
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+
+            # write to a private temp file and rename into place, so
+            # concurrent exiting processes can't see a half-written cache
+            tmp_filename = '{0}.{1}'.format(filename, os.getpid())
+            with open(tmp_filename, 'wb') as f:
+                pickle.dump(cls._introspect_cache, f, 2)
+            replace = getattr(os, 'replace', os.rename)
+            replace(tmp_filename, filename)
+        except Exception:
+            # a failed write just means a cold start next time
+            pass
+
+
+@lru_cache(maxsize=None)
+def _introspect_get(operation_name):
+    # fall back to the dict cache, which holds anything preloaded from disc
+    cache = Introspect._introspect_cache
+    entry = cache.get(operation_name)
+    if entry is None:
+        entry = cache[operation_name] = Introspect(operation_name)
+        Introspect._cache_dirty = True
+    elif not entry.types_resolved:
+        entry._resolve_types()
+
+    return entry
+
+
+# a hash mapping operation names to introspection data, preloaded from the
+# disc cache if we have one ... save any new entries on exit
+#
+# hits go through lru_cache, which is a single C-level probe
+Introspect.get = staticmethod(_introspect_get)
+Introspect._introspect_cache = Introspect._load_cache()
+Introspect._cache_dirty = False
+atexit.register(Introspect._save_cache)
+
+
+# gather the input references of every Image inside thing into references,
+# descending into subarrays as we see them
+#
+# a flat walk with an explicit stack, rather than a predicate passed to a
+# generic searcher, so the dispatcher doesn't pay a closure allocation and a
+# Python call per element
+def _add_references(thing, references):
+    stack = [thing]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, _Image):
+            for i in x._references:
+                if i not in references:
+                    references.append(i)
+        else:
+            t = type(x)
+            if t is list or t is tuple:
+                stack.extend(reversed(x))
+
+
+# attach references to every Image inside thing
+def _set_references(thing, references):
+    stack = [thing]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, _Image):
+            x._references += references
+        else:
+            t = type(x)
+            if t is list or t is tuple:
+                stack.extend(reversed(x))
 
 
 class Operation(pyvips.VipsObject):
@@ -170,29 +381,47 @@ class Operation(pyvips.VipsObject):
     # cache nickname -> docstring here
     _docstring_cache = {}
 
+    # and nickname -> sphinx docs, since generate_sphinx_all renders each
+    # operation twice
+    _sphinx_cache = {}
+
     def __init__(self, pointer):
         # logger.debug('Operation.__init__: pointer = %s', pointer)
         super(Operation, self).__init__(pointer)
 
     @staticmethod
     def new_from_name(operation_name):
-        vop = vips_lib.vips_operation_new(_to_bytes(operation_name))
-        if vop == ffi.NULL:
+        vop = _vips_operation_new(_to_bytes(operation_name))
+        if vop == _ffi_NULL:
             raise Error('no such operation {0}'.format(operation_name))
         return Operation(vop)
 
-    def set(self, name, flags, match_image, value):
+    def set(self, name, flags, gtype, match_image, value):
+        if _Image is None:
+            _resolve_image()
+
+        # most args are an Image already and need no coercion ... this is
+        # the dominant case, so check it first with an exact type test
+        if type(value) is _Image:
+            if (flags & _MODIFY) != 0:
+                # make sure we have a unique copy
+                value = value.copy().copy_memory()
+
+            super(Operation, self).set(name, value)
+            return
+
         # if the object wants an image and we have a constant, _imageize it
         #
         # if the object wants an image array, _imageize any constants in the
         # array
+        #
+        # the gtype comes from the introspection data, so we don't need to
+        # query the operation again
         if match_image:
-            gtype = self.get_typeof(name)
-
-            if gtype == pyvips.GValue.image_type:
-                value = pyvips.Image._imageize(match_image, value)
-            elif gtype == pyvips.GValue.array_image_type:
-                value = [pyvips.Image._imageize(match_image, x)
+            if gtype == _image_type:
+                value = _Image._imageize(match_image, value)
+            elif gtype == _array_image_type:
+                value = [_Image._imageize(match_image, x)
                          for x in value]
 
         # MODIFY args need to be copied before they are set
@@ -215,10 +444,16 @@ class Operation(pyvips.VipsObject):
 
         """
 
-        logger.debug('VipsOperation.call: operation_name = %s', operation_name)
+        # even a disabled debug call costs a tuple build and a dispatch, and
+        # this is the hottest path in pyvips
+        # logger.debug('VipsOperation.call: operation_name = %s',
+        #              operation_name)
         # logger.debug('VipsOperation.call: args = %s, kwargs =%s',
         #              args, kwargs)
 
+        if _Image is None:
+            _resolve_image()
+
         intro = Introspect.get(operation_name)
 
         if len(intro.required_input) != len(args):
@@ -230,94 +465,136 @@ class Operation(pyvips.VipsObject):
         op = Operation.new_from_name(operation_name)
 
         # set any string options before any args so they can't be
-        # overridden
+        # overridden ... this is an FFI hop, so skip it for the usual empty
+        # string
         string_options = kwargs.pop('string_options', '')
-        if not op.set_string(string_options):
+        if string_options and not op.set_string(string_options):
             raise Error('unable to call {0}'.format(operation_name))
 
+        # collect a list of all input references here ... we can't use a set,
+        # unfortunately, because bytearrays are unhashable
+        #
+        # most calls have a single input image, so borrow its _references
+        # rather than building a merged copy ... merged tracks whether
+        # references is a private list we are free to append to
+        references = None
+        merged = False
+
         # the first image argument is the thing we expand constants to
         # match ... look inside tables for images, since we may be passing
         # an array of images as a single param
-        match_image = _find_inside(lambda x: isinstance(x, pyvips.Image),
-                                   args)
-
-        logger.debug('VipsOperation.call: match_image = %s', match_image)
-
-        # collect a list of all input references here ... we can't use a set,
-        # unfortunately, because bytearrays are unhashable
-        references = []
+        #
+        # gather input references in the same walk, so we only scan the
+        # args once
+        match_image = None
+        stack = list(args)
+        stack.reverse()
+        while stack:
+            x = stack.pop()
+            if isinstance(x, _Image):
+                if match_image is None:
+                    match_image = x
+
+                refs = x._references
+                if references is None:
+                    references = refs
+                elif refs and refs is not references:
+                    if not merged:
+                        references = list(references)
+                        merged = True
+                    for i in refs:
+                        if i not in references:
+                            references.append(i)
+            else:
+                t = type(x)
+                if t is list or t is tuple:
+                    stack.extend(reversed(x))
 
-        def add_reference(x):
-            if isinstance(x, pyvips.Image):
-                for i in x._references:
-                    if i not in references:
-                        references.append(i)
-            return False
+        # logger.debug('VipsOperation.call: match_image = %s', match_image)
 
         # set required input args
-        for name, value in zip(intro.required_input, args):
-            _find_inside(add_reference, value)
-            op.set(name, intro.details[name]['flags'], match_image, value)
+        for (name, flags, details), value in \
+                zip(intro.required_input_details, args):
+            op.set(name, flags, details['type'], match_image, value)
 
         # set any optional args
-        for name in kwargs:
-            value = kwargs[name]
-            details = intro.details[name]
-
-            if (name not in intro.optional_input and
-                    name not in intro.optional_output):
-                raise Error('{0} does not support optional argument {1}'
-                            .format(operation_name, name))
-
-            if (details['flags'] & _DEPRECATED) != 0:
-                logger.info('{0} argument {1} is deprecated',
-                            operation_name, name)
-
-            _find_inside(add_reference, value)
-            op.set(name, details['flags'], match_image, value)
+        if kwargs:
+            # kwarg values can add references, so make sure we are not
+            # appending to an input image's own list
+            if not merged:
+                if references is None:
+                    references = []
+                else:
+                    references = list(references)
+                merged = True
+
+            for name in kwargs:
+                value = kwargs[name]
+
+                if name not in intro.optional_details:
+                    raise Error('{0} does not support optional argument {1}'
+                                .format(operation_name, name))
+                flags, details = intro.optional_details[name]
+
+                if (flags & _DEPRECATED) != 0:
+                    logger.info('{0} argument {1} is deprecated',
+                                operation_name, name)
+
+                _add_references(value, references)
+                op.set(name, flags, details['type'], match_image, value)
 
         # build operation
-        vop = vips_lib.vips_cache_operation_build(op.pointer)
-        if vop == ffi.NULL:
+        vop = _vips_cache_operation_build(op.pointer)
+        if vop == _ffi_NULL:
             raise Error('unable to call {0}'.format(operation_name))
         op = Operation(vop)
 
-        # attach all input refs to output x
-        def set_reference(x):
-            if isinstance(x, pyvips.Image):
-                x._references += references
-            return False
-
-        # fetch required output args (plus modified input images)
-        result = []
-        for name in intro.required_output:
-            value = op.get(name)
-            _find_inside(set_reference, value)
-            result.append(value)
-
-        # fetch optional output args
-        opts = {}
-        for name in intro.optional_output:
-            if name in kwargs:
+        # attach all input refs to each output ... when there were no input
+        # references (eg. "black" and the other source operations) the walk
+        # would do nothing, so skip it entirely
+        #
+        # fetch required output args (plus modified input images) ... most
+        # operations have exactly one output and no optional args, so skip
+        # the intermediate list for that case
+        required_output = intro.required_output
+        if len(required_output) == 1 and not kwargs:
+            result = op.get(required_output[0])
+            if references:
+                _set_references(result, references)
+        else:
+            result = []
+            for name in required_output:
                 value = op.get(name)
-                _find_inside(set_reference, value)
-                opts[name] = value
+                if references:
+                    _set_references(value, references)
+                result.append(value)
+
+            # fetch optional output args
+            opts = {}
+            if kwargs:
+                for name in intro.optional_output:
+                    if name in kwargs:
+                        value = op.get(name)
+                        if references:
+                            _set_references(value, references)
+                        opts[name] = value
 
-        if len(opts) > 0:
-            result.append(opts)
+            if len(opts) > 0:
+                result.append(opts)
 
-        vips_lib.vips_object_unref_outputs(op.vobject)
+            if len(result) == 0:
+                result = None
+            elif len(result) == 1:
+                result = result[0]
 
-        if len(result) == 0:
-            result = None
-        elif len(result) == 1:
-            result = result[0]
+        _vips_object_unref_outputs(op.vobject)
 
-        logger.debug('VipsOperation.call: result = %s', result)
+        # logger.debug('VipsOperation.call: result = %s', result)
 
         return result
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def generate_docstring(operation_name):
         """Make a google-style docstring.
 
@@ -334,14 +611,19 @@ class Operation(pyvips.VipsObject):
             raise Error('No such operator.',
                         'operator "{0}" is deprecated'.format(operation_name))
 
-        result = intro.description[0].upper() + intro.description[1:] + '.\n\n'
-        result += 'Example:\n'
+        # build in a list and join once at the end, rather than paying a
+        # string reallocation per +=
+        parts = []
 
-        result += '   ' + ', '.join(intro.required_output) + ' = '
+        parts.append(intro.description[0].upper() +
+                     intro.description[1:] + '.\n\n')
+        parts.append('Example:\n')
+
+        parts.append('   ' + ', '.join(intro.required_output) + ' = ')
         if intro.member_x is not None:
-            result += intro.member_x + '.' + operation_name + '('
+            parts.append(intro.member_x + '.' + operation_name + '(')
         else:
-            result += 'pyvips.Image.' + operation_name + '('
+            parts.append('pyvips.Image.' + operation_name + '(')
 
         args = []
         args += intro.method_args
@@ -349,36 +631,38 @@ class Operation(pyvips.VipsObject):
                  for x in intro.optional_input]
         args += [x + '=bool'
                  for x in intro.optional_output]
-        result += ", ".join(args) + ')\n'
+        parts.append(", ".join(args) + ')\n')
 
         def argstr(name):
             details = intro.details[name]
             return (u'    {0} ({1}): {2}\n'.
                     format(name,
                            GValue.gtype_to_python(details['type']),
-                           details['blurb']))
+                           intro.get_blurb(name)))
 
-        result += '\nReturns:\n'
+        parts.append('\nReturns:\n')
         for name in intro.required_output:
-            result += argstr(name)
+            parts.append(argstr(name))
 
-        result += '\nArgs:\n'
+        parts.append('\nArgs:\n')
         if intro.member_x is not None:
-            result += argstr(intro.member_x)
+            parts.append(argstr(intro.member_x))
         for name in intro.method_args:
-            result += argstr(name)
+            parts.append(argstr(name))
 
         if len(intro.optional_input) > 0:
-            result += '\nKeyword args:\n'
+            parts.append('\nKeyword args:\n')
             for name in intro.optional_input:
-                result += argstr(name)
+                parts.append(argstr(name))
 
         if len(intro.optional_output) > 0:
-            result += '\nOther Parameters:\n'
+            parts.append('\nOther Parameters:\n')
             for name in intro.optional_output:
-                result += argstr(name)
+                parts.append(argstr(name))
+
+        parts.append('\nRaises:\n    :class:`.Error`\n')
 
-        result += '\nRaises:\n    :class:`.Error`\n'
+        result = ''.join(parts)
 
         # add to cache to save building again
         Operation._docstring_cache[operation_name] = result
@@ -393,49 +677,57 @@ class Operation(pyvips.VipsObject):
 
         """
 
+        # we cache these to save regeneration
+        if operation_name in Operation._sphinx_cache:
+            return Operation._sphinx_cache[operation_name]
+
         intro = Introspect.get(operation_name)
         if (intro.flags & _OPERATION_DEPRECATED) != 0:
             raise Error('No such operator.',
                         'operator "{0}" is deprecated'.format(operation_name))
 
+        # build in a list and join once at the end, rather than paying a
+        # string reallocation per +=
+        parts = []
+
         if intro.member_x is not None:
-            result = '.. method:: '
+            parts.append('.. method:: ')
         else:
-            result = '.. staticmethod:: '
+            parts.append('.. staticmethod:: ')
         args = []
         args += intro.method_args
         args += [x + '=' + GValue.gtype_to_python(intro.details[x]['type'])
                  for x in intro.optional_input]
         args += [x + '=bool'
                  for x in intro.optional_output]
-        result += operation_name + '(' + ", ".join(args) + ')\n\n'
+        parts.append(operation_name + '(' + ", ".join(args) + ')\n\n')
 
-        result += intro.description[0].upper() + \
-            intro.description[1:] + '.\n\n'
+        parts.append(intro.description[0].upper() +
+                     intro.description[1:] + '.\n\n')
 
-        result += 'Example:\n'
-        result += '    ' + ', '.join(intro.required_output) + ' = '
+        parts.append('Example:\n')
+        parts.append('    ' + ', '.join(intro.required_output) + ' = ')
         if intro.member_x is not None:
-            result += intro.member_x + "." + operation_name + '('
+            parts.append(intro.member_x + "." + operation_name + '(')
         else:
-            result += 'pyvips.Image.' + operation_name + '('
+            parts.append('pyvips.Image.' + operation_name + '(')
         args = []
         args += intro.method_args
         args += [x + '=' + GValue.gtype_to_python(intro.details[x]['type'])
                  for x in intro.optional_input]
-        result += ', '.join(args)
-        result += ')\n\n'
+        parts.append(', '.join(args))
+        parts.append(')\n\n')
 
         for name in intro.method_args + intro.optional_input:
             details = intro.details[name]
-            result += (':param {0} {1}: {2}\n'.
-                       format(GValue.gtype_to_python(details['type']),
-                              name,
-                              details['blurb']))
+            parts.append(':param {0} {1}: {2}\n'.
+                         format(GValue.gtype_to_python(details['type']),
+                                name,
+                                intro.get_blurb(name)))
         for name in intro.optional_output:
-            result += (':param bool {0}: enable output: {1}\n'.
-                       format(name,
-                              intro.details[name]['blurb']))
+            parts.append(':param bool {0}: enable output: {1}\n'.
+                         format(name,
+                                intro.get_blurb(name)))
 
         output_types = [GValue.gtype_to_python(intro.details[name]['type'])
                         for name in intro.required_output]
@@ -448,8 +740,13 @@ class Operation(pyvips.VipsObject):
             output_types += ['Dict[str, mixed]']
             output_type += ' or list[' + ', '.join(output_types) + ']'
 
-        result += ':rtype: ' + output_type + '\n'
-        result += ':raises Error:\n'
+        parts.append(':rtype: ' + output_type + '\n')
+        parts.append(':raises Error:\n')
+
+        result = ''.join(parts)
+
+        # add to cache to save building again
+        Operation._sphinx_cache[operation_name] = result
 
         return result
 
@@ -478,7 +775,19 @@ class Operation(pyvips.VipsObject):
         # all names we can generate docstrings for
         all_names = []
 
-        def add_name(gtype, a, b):
+        # walk the subtypes of VipsOperation with a worklist ... type_map
+        # only maps over direct children, and driving it iteratively lets us
+        # build the FFI callback once rather than once per type
+        pending = [type_from_name('VipsOperation')]
+
+        def add_child(gtype, a, b):
+            pending.append(gtype)
+            return ffi.NULL
+
+        cb = ffi.callback('VipsTypeMap2Fn', add_child)
+        while pending:
+            gtype = pending.pop()
+
             if gtype in alias_gtypes:
                 name = alias_gtypes[gtype]
             else:
@@ -490,11 +799,7 @@ class Operation(pyvips.VipsObject):
             except Error:
                 pass
 
-            type_map(gtype, add_name)
-
-            return ffi.NULL
-
-        type_map(type_from_name('VipsOperation'), add_name)
+            vips_lib.vips_type_map(gtype, cb, ffi.NULL, ffi.NULL)
 
         all_names.sort()
 
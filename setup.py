@@ -42,15 +42,15 @@ pyvips_classifiers = [
 ]
 
 setup_deps = [
-    'cffi>=1.0.0',
+    'cffi>=1.6',
 ]
 
 install_deps = [
-    'cffi>=1.0.0',
+    'cffi>=1.6',
 ]
 
 test_deps = [
-    'cffi>=1.0.0',
+    'cffi>=1.6',
     'pytest-runner',
     'pytest',
     'pytest-flake8',
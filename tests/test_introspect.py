@@ -0,0 +1,88 @@
+# vim: set fileencoding=utf-8 :
+
+import os
+import pickle
+import subprocess
+import sys
+
+import pyvips
+from pyvips import Introspect
+
+
+class TestIntrospectCache:
+    def test_pickle_round_trip(self):
+        intro = Introspect.get('black')
+        copy = pickle.loads(pickle.dumps(intro, 2))
+
+        assert copy.name == intro.name
+        assert copy.description == intro.description
+        assert copy.required_input == intro.required_input
+        assert copy.optional_input == intro.optional_input
+        assert copy.required_output == intro.required_output
+
+        # gtypes are pickled by name and resolved lazily, since many gtypes
+        # are only registered once an operation uses them
+        assert not copy.types_resolved
+        assert copy.details['width']['type'] == 'gint'
+
+        copy._resolve_types()
+        assert copy.details['width']['type'] == intro.details['width']['type']
+
+        # the precomputed detail records must alias the details dicts again
+        name, flags, details = copy.required_input_details[0]
+        assert details is copy.details[name]
+
+    def test_save_and_load(self, tmpdir, monkeypatch):
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+        monkeypatch.setattr(Introspect, '_introspect_cache',
+                            {'black': Introspect('black')})
+        monkeypatch.setattr(Introspect, '_cache_dirty', True)
+
+        Introspect._save_cache()
+        assert os.path.exists(Introspect._cache_filename())
+
+        cache = Introspect._load_cache()
+        assert 'black' in cache
+
+        entry = cache['black']
+        assert not entry.types_resolved
+        entry._resolve_types()
+        assert entry.details['width']['type'] == pyvips.GValue.gint_type
+
+    def test_load_ignores_corrupt_cache(self, tmpdir, monkeypatch):
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+
+        filename = Introspect._cache_filename()
+        os.makedirs(os.path.dirname(filename))
+        with open(filename, 'wb') as f:
+            f.write(b'this is not a pickle')
+
+        assert Introspect._load_cache() == {}
+
+    def test_warm_start_across_processes(self, tmpdir):
+        env = dict(os.environ, XDG_CACHE_HOME=str(tmpdir))
+
+        # a cold start introspects gaussblur, which has an enum arg, and
+        # saves the cache on exit
+        prog = 'import pyvips; pyvips.Introspect.get("gaussblur")'
+        subprocess.check_call([sys.executable, '-c', prog], env=env)
+
+        # enum gtypes are registered lazily, so a warm start must resolve
+        # them again before the cached types are any use, and must still be
+        # able to rewrite the cache afterwards
+        prog = '\n'.join([
+            'import pyvips',
+            'from pyvips import Introspect',
+            'entry = Introspect._introspect_cache.get("gaussblur")',
+            'assert entry is not None',
+            'assert not entry.types_resolved',
+            'intro = Introspect.get("gaussblur")',
+            'assert intro is entry',
+            'assert intro.details["precision"]["type"] != 0',
+            'doc = pyvips.Operation.generate_docstring("gaussblur")',
+            'assert "<unknown type>" not in doc',
+            'Introspect._cache_dirty = True',
+            'Introspect._save_cache()',
+            'assert "gaussblur" in Introspect._load_cache()',
+        ])
+        subprocess.check_call([sys.executable, '-c', prog], env=env)